@@ -1,15 +1,66 @@
-from flask import Flask, jsonify, request
-from flask_cors import CORS
+from flask import Flask, Response, request
+from flask.json.provider import JSONProvider
 from flasgger import Swagger
-from functools import wraps
+from flask_compress import Compress
+from werkzeug.http import generate_etag
 from routes import field_bp
-from services import EarthEngineService
+from services import get_ee_service
 from config import Config
-import os
+import json
+import orjson
+
+
+# Swagger specs use integer status codes as keys, hence OPT_NON_STR_KEYS.
+_ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+class OrjsonProvider(JSONProvider):
+    """JSON provider backed by orjson, which encodes nested dicts and float arrays in C.
+
+    Request bodies parsed with ``request.get_json`` go through ``loads`` as well.
+    """
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=_ORJSON_OPTIONS).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # jsonify lands here; hand orjson's bytes to the response without a str round-trip.
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj, option=_ORJSON_OPTIONS), mimetype='application/json')
+
 
 app = Flask(__name__)
-CORS(app)
-from auth import require_api_key
+app.json = OrjsonProvider(app)
+# Serve /api/health/ and /api/health alike instead of redirecting
+app.url_map.strict_slashes = False
+
+# Compress JSON bodies on the wire; brotli first for clients that accept it.
+# Level 4 keeps compression cheap relative to the size win on nested reports.
+app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+app.config['COMPRESS_LEVEL'] = 4
+app.config['COMPRESS_BR_LEVEL'] = 4
+Compress(app)
+
+# The API is open to any origin, so CORS needs no per-request rule matching.
+_CORS_HEADERS = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Headers': 'Content-Type, X-API-Key',
+    'Access-Control-Allow-Methods': 'GET, POST, OPTIONS'
+}
+
+@app.before_request
+def cors_preflight():
+    """Answer CORS preflight requests for any path without reaching a view."""
+    if request.method == 'OPTIONS':
+        return '', 204
+
+@app.after_request
+def add_cors_headers(response):
+    response.headers.update(_CORS_HEADERS)
+    return response
 
 # Configure Swagger UI
 swagger_config = {
@@ -53,55 +104,55 @@ swagger = Swagger(app,
         }
     })
 
-ee_service = EarthEngineService()
+ee_service = get_ee_service()
+
+# Initialize Earth Engine once at startup so requests never pay for the check.
+if not Config.GEE_PROJECT_ID:
+    print("Warning: GEE_PROJECT_ID not set. Earth Engine may not initialize properly.")
+if not ee_service.initialize(Config.GEE_PROJECT_ID):
+    print("Earth Engine initialization failed. Some features may not work.")
 
 app.config['ee_service'] = ee_service
 
 app.register_blueprint(field_bp, url_prefix='/api')
 
-@app.before_request
-def initialize_earth_engine():
-    """Initialize Earth Engine before first request."""
-    if not ee_service.initialized:
-        project_id = Config.GEE_PROJECT_ID
-        if not project_id:
-            print("Warning: GEE_PROJECT_ID not set. Earth Engine may not initialize properly.")
-        
-        success = ee_service.initialize(project_id)
-        if not success:
-            print("Earth Engine initialization failed. Some features may not work.")
+# The root document never changes, so serialize it once at import time.
+_HOME_JSON = json.dumps({
+    'service': 'GreenPulse - Agricultural Monitoring Backend',
+    'version': '1.0.0',
+    'description': 'Real-time insights and recommendations for farmers using Google Earth Engine',
+    'endpoints': {
+        'health': 'GET /api/health - Check service health',
+        'yield_prediction': 'POST /api/yield-prediction - Analyze field productivity zones',
+        'water_stress': 'POST /api/water-stress - Detect water stress areas',
+        'crop_growth': 'POST /api/crop-growth - Track crop growth over time',
+        'disease_alert': 'POST /api/disease-alert - Detect disease and pest risks',
+        'historical_comparison': 'POST /api/historical-comparison - Compare with past seasons',
+        'ai_assistant': 'POST /api/ai-assistant - Get AI recommendations',
+        'report': 'POST /api/report - Generate field analysis report',
+        'full_analysis': 'POST /api/full-analysis - Comprehensive field analysis'
+    },
+    'documentation': {
+        'example_coordinates': [
+            [
+                [-122.4194, 37.7749],
+                [-122.4094, 37.7749],
+                [-122.4094, 37.7649],
+                [-122.4194, 37.7649],
+                [-122.4194, 37.7749]
+            ]
+        ],
+        'note': 'Coordinates should be provided as [longitude, latitude] pairs forming a polygon'
+    }
+}).encode('utf-8')
+_HOME_ETAG = generate_etag(_HOME_JSON)
 
 @app.route('/')
 def home():
     """Root endpoint with API documentation."""
-    return jsonify({
-        'service': 'GreenPulse - Agricultural Monitoring Backend',
-        'version': '1.0.0',
-        'description': 'Real-time insights and recommendations for farmers using Google Earth Engine',
-        'endpoints': {
-            'health': 'GET /api/health - Check service health',
-            'yield_prediction': 'POST /api/yield-prediction - Analyze field productivity zones',
-            'water_stress': 'POST /api/water-stress - Detect water stress areas',
-            'crop_growth': 'POST /api/crop-growth - Track crop growth over time',
-            'disease_alert': 'POST /api/disease-alert - Detect disease and pest risks',
-            'historical_comparison': 'POST /api/historical-comparison - Compare with past seasons',
-            'ai_assistant': 'POST /api/ai-assistant - Get AI recommendations',
-            'report': 'POST /api/report - Generate field analysis report',
-            'full_analysis': 'POST /api/full-analysis - Comprehensive field analysis'
-        },
-        'documentation': {
-            'example_coordinates': [
-                [
-                    [-122.4194, 37.7749],
-                    [-122.4094, 37.7749],
-                    [-122.4094, 37.7649],
-                    [-122.4194, 37.7649],
-                    [-122.4194, 37.7749]
-                ]
-            ],
-            'note': 'Coordinates should be provided as [longitude, latitude] pairs forming a polygon'
-        }
-    })
+    response = Response(_HOME_JSON, mimetype='application/json')
+    response.set_etag(_HOME_ETAG, weak=True)
+    return response.make_conditional(request)
 
 if __name__ == '__main__':
     port = Config.PORT
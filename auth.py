@@ -2,20 +2,34 @@ from functools import wraps
 from flask import request, jsonify
 from config import Config
 from hmac import compare_digest
+import json
+
+# Encoded once so each request compares bytes against a module-level constant.
+_API_KEY_BYTES = Config.API_KEY.encode('utf-8')
+
+# Scanners hit every endpoint without a key; answer them with a prebuilt response.
+_MISSING_KEY_RESPONSE = (
+    json.dumps({'error': 'Missing API key'}, separators=(',', ':')).encode('utf-8'),
+    401,
+    {'Content-Type': 'application/json'}
+)
 
 
 def require_api_key(f):
     """Decorator to require API key in X-API-Key header.
 
-    Uses constant-time comparison to avoid timing attacks.
+    Uses constant-time comparison to avoid timing attacks. Keys of the wrong
+    length are rejected before the comparison.
     """
     @wraps(f)
     def decorated(*args, **kwargs):
-        api_key = request.headers.get('X-API-Key')
+        # Read the WSGI environ directly rather than building the headers view
+        api_key = request.environ.get('HTTP_X_API_KEY')
         if not api_key:
-            return jsonify({'error': 'Missing API key'}), 401
+            return _MISSING_KEY_RESPONSE
 
-        if not compare_digest(api_key, Config.API_KEY):
+        api_key_bytes = api_key.encode('utf-8')
+        if len(api_key_bytes) != len(_API_KEY_BYTES) or not compare_digest(api_key_bytes, _API_KEY_BYTES):
             return jsonify({'error': 'Invalid API key'}), 401
 
         return f(*args, **kwargs)
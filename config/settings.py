@@ -1,4 +1,5 @@
 import os
+from types import MappingProxyType
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -10,17 +11,38 @@ class Config:
     # External Services
     OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
     GROQ_API_KEY = os.getenv("GROQ_API_KEY")
-    GROQ_MODEL = os.getenv("GROQ_MODEL", "llama‑3.1‑8b‑instant")
+    GROQ_MODEL = os.getenv("GROQ_MODEL", "llama-3.1-8b-instant")
+    # Seconds a completion is reused for an identical prompt
+    GROQ_CACHE_TTL = int(os.getenv('GROQ_CACHE_TTL', 1800))
     GEE_PROJECT_ID = os.getenv('GEE_PROJECT_ID')
     GEE_SERVICE_ACCOUNT_KEY = os.getenv('GEE_SERVICE_ACCOUNT_KEY')
+    # Route Earth Engine calls through the endpoint meant for automated, parallel
+    # getInfo traffic. Off by default: the map routes serve interactive tiles.
+    GEE_HIGH_VOLUME = os.getenv('GEE_HIGH_VOLUME', 'False').lower() == 'true'
     PORT = int(os.getenv('PORT', 5000))
     DEBUG = os.getenv('DEBUG', 'False').lower() == 'true'
     
-    NDVI_THRESHOLDS = {
+    # Seconds an Earth Engine analysis result is reused for identical inputs.
+    # Past seasons never change, so historical comparisons live longer.
+    ANALYSIS_CACHE_TTL = int(os.getenv('ANALYSIS_CACHE_TTL', 1800))
+    HISTORICAL_CACHE_TTL = int(os.getenv('HISTORICAL_CACHE_TTL', 6 * 3600))
+    
+    # Largest polygon accepted before any Earth Engine call
+    MAX_POLYGON_VERTICES = int(os.getenv('MAX_POLYGON_VERTICES', 2000))
+    MAX_FIELD_AREA_KM2 = float(os.getenv('MAX_FIELD_AREA_KM2', 10000))
+    
+    # Optional Redis shared by all workers, e.g. redis://localhost:6379/0
+    REDIS_URL = os.getenv('REDIS_URL')
+    
+    # Read-only so no caller can shift the zone boundaries at runtime
+    NDVI_THRESHOLDS = MappingProxyType({
         'high': 0.6,
         'medium': 0.4,
         'low': 0.0
-    }
+    })
+    
+    # ee.Reducer names combined for field NDVI statistics, shared by every service
+    STATS_REDUCER_SPEC = ('mean', 'minMax', 'stdDev')
     
     WATER_STRESS_THRESHOLD = 0.3
     
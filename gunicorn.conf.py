@@ -0,0 +1,20 @@
+import multiprocessing
+import os
+
+# Threads hide Earth Engine latency inside a worker while separate processes keep
+# JSON and dict assembly from contending on a single GIL.
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+workers = int(os.getenv('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+worker_class = 'gthread'
+threads = int(os.getenv('GUNICORN_THREADS', 8))
+
+
+def post_worker_init(worker):
+    """Give each worker its own Earth Engine session when the app was preloaded."""
+    if worker.cfg.preload_app:
+        import ee
+        from app import ee_service
+        from config import Config
+        # Drop the HTTP session inherited from the master; its sockets must not be shared
+        ee.Reset()
+        ee_service.initialize(Config.GEE_PROJECT_ID)
@@ -1,62 +1,205 @@
-from flask import Blueprint, request, jsonify, current_app
-from services import EarthEngineService, AIAssistantService, ReportService
-from datetime import datetime, timedelta
+from flask import Blueprint, Response, request, jsonify, current_app, g
+import ee
+from dataclasses import dataclass
+from datetime import date, timedelta
+from types import MappingProxyType
+from typing import Optional
+from functools import lru_cache, wraps
+from threading import Lock, RLock
+from concurrent.futures import Future
+from cachetools import TTLCache
 from auth import require_api_key
+from services import get_report_service
 from flasgger import swag_from
+from werkzeug.http import generate_etag
+from config import Config
 import json
+import orjson
+import math
+import time
 import hashlib
+import fastjsonschema
 
-MAP_CACHE = {}
 TOKEN_LIFETIME_HOURS = 1
 
+# Map tiles expire with their token; the size cap keeps field_id churn from
+# growing memory without bound. Each shard pairs the cache with the keys seen
+# once in the last 10 minutes: a map is only admitted on its second request
+# (LRU-2), so one-off batch scans cannot evict hot entries. Sharding keeps
+# threads working on different fields off each other's lock.
+_MAP_SHARD_COUNT = 16
+_MAP_SHARDS = tuple(
+    (
+        TTLCache(maxsize=4096 // _MAP_SHARD_COUNT, ttl=TOKEN_LIFETIME_HOURS * 3600),
+        TTLCache(maxsize=16384 // _MAP_SHARD_COUNT, ttl=600),
+        RLock()
+    )
+    for _ in range(_MAP_SHARD_COUNT)
+)
+
+# getMapId calls currently running, so concurrent requests for the same map
+# wait for one Earth Engine round-trip instead of each starting their own.
+_INFLIGHT = {}
+_INFLIGHT_LOCK = Lock()
+_INFLIGHT_TIMEOUT = 30
+
+# Bound once at import; the default-date helper runs on every request.
+_today = date.today
+_monotonic = time.monotonic
+
 def _coords_hash(coords):
     """Generate a consistent hash from coordinates."""
     coords_str = json.dumps(coords, sort_keys=True)
     return hashlib.md5(coords_str.encode('utf-8')).hexdigest()
 
-def get_cached_map(field_id, map_type, coordinates):
-    key = (field_id, map_type, _coords_hash(coordinates))
-    entry = MAP_CACHE.get(key)
-    if entry:
-        age = (datetime.now() - entry['created']).total_seconds() / 3600
-        if age < TOKEN_LIFETIME_HOURS:
-            return entry
+@dataclass(slots=True, frozen=True)
+class MapCacheEntry:
+    mapid: str
+    token: Optional[str]
+    # Formatted and serialized once so cache hits return the response body as-is
+    tile_url: str
+    body: bytes
+
+def _map_key(field_id, map_type, coordinates):
+    return (field_id, map_type, _coords_hash(coordinates))
+
+def _map_shard(key):
+    return _MAP_SHARDS[hash(key) % _MAP_SHARD_COUNT]
+
+def get_cached_map(key):
+    cache, _, lock = _map_shard(key)
+    with lock:
+        return cache.get(key)
+
+def cache_map(key, mapid, token, tile_url, description):
+    """Build the entry for a map and store it if ``key`` has been requested before."""
+    body = orjson.dumps({'tile_url': tile_url, 'description': description})
+    entry = MapCacheEntry(mapid, token, tile_url, body)
+    cache, recent, lock = _map_shard(key)
+    with lock:
+        if recent.pop(key, None) is None:
+            recent[key] = True
         else:
-            del MAP_CACHE[key]
+            cache[key] = entry
+    return entry
+
+field_bp = Blueprint('field', __name__)
+
+# Compiled once per process so malformed polygons are rejected before any
+# Earth Engine round-trip.
+_check_field_request = fastjsonschema.compile({
+    'type': 'object',
+    'properties': {
+        'coordinates': {
+            'type': 'array',
+            'items': {
+                'type': 'array',
+                'minItems': 3,
+                'items': {'type': 'array', 'minItems': 2, 'maxItems': 3, 'items': {'type': 'number'}}
+            }
+        },
+        'field_id': {'type': 'string'},
+        'include_time_series': {'type': 'boolean'}
+    },
+    'required': ['coordinates']
+})
+
+def _validate_field_request(data):
+    """Return an error message if the body is not a valid field request, else None."""
+    if not isinstance(data, dict) or not data.get('coordinates'):
+        return 'Coordinates are required'
+    try:
+        _check_field_request(data)
+    except fastjsonschema.JsonSchemaException as e:
+        return e.message
     return None
 
-def cache_map(field_id, map_type, coordinates, mapid, token):
-    key = (field_id, map_type, _coords_hash(coordinates))
-    MAP_CACHE[key] = {
-        'mapid': mapid,
-        'token': token,
-        'created': datetime.now()
-    }
+_KM_PER_DEGREE = 111.32
 
-field_bp = Blueprint('field', __name__)
-ee_service = EarthEngineService()
-ai_service = AIAssistantService()
-report_service = ReportService()
+def _ring_area_km2(ring):
+    """Approximate a ring's area with the shoelace formula on an equirectangular projection."""
+    lat_scale = math.cos(math.radians(sum(point[1] for point in ring) / len(ring)))
+    twice_area = 0.0
+    for (x1, y1), (x2, y2) in zip(ring, ring[1:] + ring[:1]):
+        twice_area += x1 * y2 - x2 * y1
+    return abs(twice_area) / 2 * _KM_PER_DEGREE ** 2 * lat_scale
 
-def _generate_map_url(field_id, map_type, coordinates, image_func, vis):
-    cached = get_cached_map(field_id, map_type, coordinates)
-    if cached:
-        mapid = cached['mapid']
-        token = cached.get('token')
-        base_url = f"https://earthengine.googleapis.com/v1alpha/{mapid}/tiles/{{z}}/{{x}}/{{y}}"
-        return f"{base_url}?token={token}" if token else base_url
-
-    geometry = ee_service.get_field_bounds(coordinates)
-    image = image_func(geometry)
-    map_id = image.getMapId(vis)
-    mapid = map_id['mapid']
-    token = map_id.get('token')
-    cache_map(field_id, map_type, coordinates, mapid, token)
+def _validate_polygon(coordinates, max_vertices=None, max_area_km2=None):
+    """Return an error message if the polygon is too complex or too large to analyze, else None."""
+    max_vertices = max_vertices or Config.MAX_POLYGON_VERTICES
+    max_area_km2 = max_area_km2 or Config.MAX_FIELD_AREA_KM2
+
+    vertices = sum(len(ring) for ring in coordinates)
+    if vertices > max_vertices:
+        return f'Polygon has {vertices} vertices; the limit is {max_vertices}'
+    area = _ring_area_km2([(position[0], position[1]) for position in coordinates[0]])
+    if area > max_area_km2:
+        return f'Field area of {area:.0f} km2 exceeds the limit of {max_area_km2:.0f} km2'
+    return None
+
+def _require_field(view):
+    """Parse and validate the field request once, exposing it as ``g.coordinates`` and ``g.field_id``."""
+    @wraps(view)
+    def decorated(*args, **kwargs):
+        data = request.get_json(cache=True, silent=True) or {}
+        error = _validate_field_request(data) or _validate_polygon(data['coordinates'])
+        if error:
+            return jsonify({'error': error}), 400
+        g.coordinates = data['coordinates']
+        g.field_id = data.get('field_id', 'default')
+        return view(*args, **kwargs)
 
-    base_url = f"https://earthengine.googleapis.com/v1alpha/{mapid}/tiles/{{z}}/{{x}}/{{y}}"
+    return decorated
+
+def _tile_url(map_id):
+    """Tile URL for a getMapId result, on whichever host and API version the client used."""
+    base_url = map_id['tile_fetcher'].url_format
+    token = map_id.get('token')
     return f"{base_url}?token={token}" if token else base_url
 
-@field_bp.route('/health', methods=['GET'])
+def _map_response_body(ee_service, field_id, map_type, coordinates, image_func, vis, description):
+    """Return the serialized ``{tile_url, description}`` body for a map, generating it on a miss."""
+    key = _map_key(field_id, map_type, coordinates)
+    cached = get_cached_map(key)
+    if cached:
+        return cached.body
+
+    with _INFLIGHT_LOCK:
+        future = _INFLIGHT.get(key)
+        leader = future is None
+        if leader:
+            future = _INFLIGHT[key] = Future()
+    if not leader:
+        return future.result(timeout=_INFLIGHT_TIMEOUT).body
+
+    try:
+        geometry = ee_service.get_field_bounds(coordinates)
+        image = image_func(geometry)
+        map_id = image.getMapId(vis)
+        entry = cache_map(key, map_id['mapid'], map_id.get('token'), _tile_url(map_id), description)
+        future.set_result(entry)
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _INFLIGHT_LOCK:
+            _INFLIGHT.pop(key, None)
+
+    return entry.body
+
+# Health probes only ever see one of two bodies, so both are serialized up front.
+_HEALTH_JSON = {
+    initialized: json.dumps({
+        'status': 'healthy',
+        'service': 'GreenPulse Backend',
+        'earth_engine_initialized': initialized
+    }).encode('utf-8')
+    for initialized in (True, False)
+}
+# Weak validators survive Flask-Compress, which rewrites strong ETags per encoding.
+_HEALTH_ETAG = {initialized: generate_etag(body) for initialized, body in _HEALTH_JSON.items()}
+
+@field_bp.route('/health', methods=['GET'], provide_automatic_options=False)
 @swag_from({
     'tags': ['Health'],
     'responses': {
@@ -73,25 +216,147 @@ def _generate_map_url(field_id, map_type, coordinates, image_func, vis):
     }
 })
 def health_check():
-    app_ee_service = current_app.config.get('ee_service')
-    is_initialized = app_ee_service.initialized if app_ee_service else ee_service.initialized
-    return jsonify({
-        'status': 'healthy',
-        'service': 'GreenPulse Backend',
-        'earth_engine_initialized': is_initialized
-    })
+    is_initialized = bool(current_app.config['ee_service'].initialized)
+    response = Response(_HEALTH_JSON[is_initialized], mimetype='application/json')
+    response.set_etag(_HEALTH_ETAG[is_initialized], weak=True)
+    # Pollers sending If-None-Match get an empty 304 instead of the body.
+    return response.make_conditional(request)
+
+
+@lru_cache(maxsize=4)
+def _date_window(today, days_back):
+    """Format the (start, end) strings for a window ending on ``today``."""
+    return (today - timedelta(days=days_back)).isoformat(), today.isoformat()
+
+
+# Seconds a default window is reused before the calendar date is read again
+_DATES_TTL = 60
+_DATES_MEMO = {}
+
+def _default_dates(days_back=30):
+    # Every request on the same day shares one pair of formatted strings, and
+    # the clock is only consulted once a minute. A race just recomputes it.
+    now = _monotonic()
+    memo = _DATES_MEMO.get(days_back)
+    if memo and now - memo[0] < _DATES_TTL:
+        return memo[1]
+    window = _date_window(_today(), days_back)
+    _DATES_MEMO[days_back] = (now, window)
+    return window
+
+
+# Visualization parameters are shared by every request, so they are read-only.
+_VIS_YIELD = MappingProxyType({"min": 0, "max": 1, "palette": ("red", "yellow", "green")})
+_VIS_WATER = MappingProxyType({"min": -1, "max": 1, "palette": ("brown", "yellow", "blue")})
+_VIS_GROWTH = MappingProxyType({"min": 0, "max": 1, "palette": ("white", "green")})
+_VIS_DISEASE = MappingProxyType({"min": -0.2, "max": 0.2, "palette": ("red", "white", "green")})
+
+
+def _ndvi_image(ee_service, geom, start_date, end_date):
+    image = ee_service.get_sentinel2_image(geom, start_date, end_date)
+    return ee_service.calculate_ndvi(image)
+
+
+def _ndmi_image(ee_service, geom, start_date, end_date):
+    image = ee_service.get_sentinel2_image(geom, start_date, end_date)
+    return ee_service.calculate_soil_moisture_index(image)
+
+
+def _ndvi_anomaly_image(ee_service, geom, start_date, end_date):
+    ndvi = _ndvi_image(ee_service, geom, start_date, end_date)
+    mean_ndvi = ndvi.reduceRegion(
+        reducer=ee.Reducer.mean(),
+        geometry=geom,
+        scale=30
+    ).get('NDVI')
+    anomaly = ndvi.subtract(mean_ndvi).rename('NDVI_Anomaly')
+    return anomaly
+
+
+def _map_view(map_type, build_image, vis, description):
+    """Build the view for a map route; routes differ only in image, palette and description."""
+    def view():
+        ee_service = current_app.config['ee_service']
+        start_date, end_date = _default_dates()
+
+        def image_func(geom):
+            return build_image(ee_service, geom, start_date, end_date)
+
+        body = _map_response_body(ee_service, g.field_id, map_type, g.coordinates, image_func, vis, description)
+        return Response(body, mimetype='application/json')
+
+    view.__name__ = f'{map_type}_map'
+    return view
+
+
+def _add_map_route(rule, map_type, build_image, vis, description, spec):
+    view = require_api_key(_require_field(swag_from(spec)(_map_view(map_type, build_image, vis, description))))
+    field_bp.add_url_rule(rule, view_func=view, methods=['POST'], provide_automatic_options=False)
+
 
+# Every map route takes the same body and only differs in its success description.
+_MAP_PARAMS = [
+    {
+        'name': 'body',
+        'in': 'body',
+        'required': True,
+        'schema': {
+            'type': 'object',
+            'properties': {
+                'coordinates': {'type': 'array', 'items': {'type': 'array'}},
+                'field_id': {'type': 'string'}
+            },
+            'required': ['coordinates']
+        }
+    }
+]
+
+def _map_swag(ok_description, description_example=None):
+    ok = {'description': ok_description}
+    if description_example:
+        ok['examples'] = {
+            'application/json': {
+                'tile_url': 'https://earthengine.googleapis.com/v1/projects/.../maps/.../tiles/{z}/{x}/{y}',
+                'description': description_example
+            }
+        }
+    return {
+        'tags': ['Maps'],
+        'parameters': _MAP_PARAMS,
+        'responses': {
+            200: ok,
+            400: {'description': 'Coordinates are required'}
+        }
+    }
 
-def _default_dates():
-    end_date = datetime.now().strftime('%Y-%m-%d')
-    start_date = (datetime.now() - timedelta(days=30)).strftime('%Y-%m-%d')
-    return start_date, end_date
 
+_add_map_route('/yield-prediction', 'yield_prediction', _ndvi_image,
+    _VIS_YIELD,
+    "🌾 NDVI map: low (red), medium (yellow), high (green) productivity zones.",
+    _map_swag('NDVI yield prediction map URL',
+              '🌾 NDVI map: low (red), medium (yellow), high (green) productivity zones.'))
 
-@field_bp.route('/yield-prediction', methods=['POST'])
+_add_map_route('/water-stress', 'water_stress', _ndmi_image,
+    _VIS_WATER,
+    "💧 NDMI map showing dry (brown) and moist (blue) areas.",
+    _map_swag('Water stress map URL'))
+
+_add_map_route('/crop-growth', 'crop_growth', _ndvi_image,
+    _VIS_GROWTH,
+    "📈 NDVI map to monitor crop development over time.",
+    _map_swag('Crop growth map URL'))
+
+_add_map_route('/disease-pest', 'disease_pest', _ndvi_anomaly_image,
+    _VIS_DISEASE,
+    "🐛 NDVI anomaly map showing abnormal vegetation (potential disease/pests).",
+    _map_swag('Disease/pest NDVI anomaly map URL'))
+
+
+@field_bp.route('/full-analysis', methods=['POST'], provide_automatic_options=False)
 @require_api_key
+@_require_field
 @swag_from({
-    'tags': ['Maps'],
+    'tags': ['Analysis'],
     'parameters': [
         {
             'name': 'body',
@@ -101,7 +366,7 @@ def _default_dates():
                 'type': 'object',
                 'properties': {
                     'coordinates': {'type': 'array', 'items': {'type': 'array'}},
-                    'field_id': {'type': 'string'}
+                    'include_time_series': {'type': 'boolean', 'default': True}
                 },
                 'required': ['coordinates']
             }
@@ -109,140 +374,35 @@ def _default_dates():
     ],
     'responses': {
         200: {
-            'description': 'NDVI yield prediction map URL',
+            'description': 'Every field analysis for the last 30 days, with a summary',
             'examples': {
                 'application/json': {
-                    'tile_url': 'https://earthengine.googleapis.com/v1alpha/projects/.../tiles/{z}/{x}/{y}?token=XYZ',
-                    'description': '🌾 NDVI map: low (red), medium (yellow), high (green) productivity zones.'
+                    'yield_prediction': {},
+                    'water_stress': {},
+                    'crop_growth': {},
+                    'disease_risk': {},
+                    'historical_comparison': {},
+                    'summary': {
+                        'overall_health_score': 72.5,
+                        'critical_alerts': ['Irrigation required - significant water stress detected'],
+                        'recommendations_count': 1
+                    }
                 }
             }
         },
         400: {'description': 'Coordinates are required'}
     }
 })
-def yield_prediction_map():
-    data = request.json
-    coordinates = data.get('coordinates')
-    field_id = data.get('field_id', 'default')
-    if not coordinates:
-        return jsonify({'error': 'Coordinates are required'}), 400
-
-    start_date, end_date = _default_dates()
-
-    def image_func(geom):
-        image = ee_service.get_sentinel2_image(geom, start_date, end_date)
-        return ee_service.calculate_ndvi(image)
-
-    vis = {"min": 0, "max": 1, "palette": ["red", "yellow", "green"]}
-    tile_url = _generate_map_url(field_id, 'yield_prediction', coordinates, image_func, vis)
-    return jsonify({
-        "tile_url": tile_url,
-        "description": "🌾 NDVI map: low (red), medium (yellow), high (green) productivity zones."
-    })
-
-
-@field_bp.route('/water-stress', methods=['POST'])
-@require_api_key
-@swag_from({
-    'tags': ['Maps'],
-    'parameters': [
-        {'name': 'body', 'in': 'body', 'required': True, 'schema': {'type': 'object', 'properties': {'coordinates': {'type': 'array'}, 'field_id': {'type': 'string'}}, 'required': ['coordinates']}}
-    ],
-    'responses': {
-        200: {'description': 'Water stress map URL'},
-        400: {'description': 'Coordinates are required'}
-    }
-})
-def water_stress_map():
-    data = request.json
-    coordinates = data.get('coordinates')
-    field_id = data.get('field_id', 'default')
-    if not coordinates:
-        return jsonify({'error': 'Coordinates are required'}), 400
-
-    start_date, end_date = _default_dates()
-
-    def image_func(geom):
-        image = ee_service.get_sentinel2_image(geom, start_date, end_date)
-        ndmi = image.normalizedDifference(['B8', 'B11']).rename('NDMI')
-        return ndmi
-
-    vis = {"min": -1, "max": 1, "palette": ["brown", "yellow", "blue"]}
-    tile_url = _generate_map_url(field_id, 'water_stress', coordinates, image_func, vis)
-    return jsonify({
-        "tile_url": tile_url,
-        "description": "💧 NDMI map showing dry (brown) and moist (blue) areas."
-    })
-
-
-@field_bp.route('/crop-growth', methods=['POST'])
-@require_api_key
-@swag_from({
-    'tags': ['Maps'],
-    'parameters': [
-        {'name': 'body', 'in': 'body', 'required': True, 'schema': {'type': 'object', 'properties': {'coordinates': {'type': 'array'}, 'field_id': {'type': 'string'}}, 'required': ['coordinates']}}
-    ],
-    'responses': {
-        200: {'description': 'Crop growth map URL'},
-        400: {'description': 'Coordinates are required'}
-    }
-})
-def crop_growth_map():
-    data = request.json
-    coordinates = data.get('coordinates')
-    field_id = data.get('field_id', 'default')
-    if not coordinates:
-        return jsonify({'error': 'Coordinates are required'}), 400
-
-    start_date, end_date = _default_dates()
-
-    def image_func(geom):
-        image = ee_service.get_sentinel2_image(geom, start_date, end_date)
-        return ee_service.calculate_ndvi(image)
-
-    vis = {"min": 0, "max": 1, "palette": ["white", "green"]}
-    tile_url = _generate_map_url(field_id, 'crop_growth', coordinates, image_func, vis)
-    return jsonify({
-        "tile_url": tile_url,
-        "description": "📈 NDVI map to monitor crop development over time."
-    })
-
-
-@field_bp.route('/disease-pest', methods=['POST'])
-@require_api_key
-@swag_from({
-    'tags': ['Maps'],
-    'parameters': [
-        {'name': 'body', 'in': 'body', 'required': True, 'schema': {'type': 'object', 'properties': {'coordinates': {'type': 'array'}, 'field_id': {'type': 'string'}}, 'required': ['coordinates']}}
-    ],
-    'responses': {
-        200: {'description': 'Disease/pest NDVI anomaly map URL'},
-        400: {'description': 'Coordinates are required'}
-    }
-})
-def disease_pest_map():
-    data = request.json
-    coordinates = data.get('coordinates')
-    field_id = data.get('field_id', 'default')
-    if not coordinates:
-        return jsonify({'error': 'Coordinates are required'}), 400
-
+def full_analysis():
+    ee_service = current_app.config['ee_service']
     start_date, end_date = _default_dates()
+    include_time_series = request.get_json(cache=True).get('include_time_series', True)
 
-    def image_func(geom):
-        image = ee_service.get_sentinel2_image(geom, start_date, end_date)
-        ndvi = ee_service.calculate_ndvi(image)
-        mean_ndvi = ndvi.reduceRegion(
-            reducer=ee_service.Reducer.mean(),
-            geometry=geom,
-            scale=30
-        ).get('NDVI')
-        anomaly = ndvi.subtract(mean_ndvi).rename('NDVI_Anomaly')
-        return anomaly
-
-    vis = {"min": -0.2, "max": 0.2, "palette": ["red", "white", "green"]}
-    tile_url = _generate_map_url(field_id, 'disease_pest', coordinates, image_func, vis)
-    return jsonify({
-        "tile_url": tile_url,
-        "description": "🐛 NDVI anomaly map showing abnormal vegetation (potential disease/pests)."
-    })
\ No newline at end of file
+    geometry = ee_service.get_field_bounds(g.coordinates)
+    # A failed analysis is reported in place so the others still reach the client.
+    report = ee_service.analyze_field(
+        geometry, start_date, end_date,
+        include_time_series=include_time_series,
+        raise_exceptions=False
+    )
+    return jsonify({**report, 'summary': get_report_service().generate_summary_statistics(report)})
@@ -1,3 +1,39 @@
+from functools import wraps
+from threading import Lock
 from .earth_engine_service import EarthEngineService
 from .ai_assistant_service import AIAssistantService
 from .report_service import ReportService
+
+
+def _lazy_singleton(factory):
+    """Call ``factory`` once on first use, even if several threads ask at the same time."""
+    lock = Lock()
+    instance = []
+
+    @wraps(factory)
+    def getter():
+        if not instance:
+            with lock:
+                if not instance:
+                    instance.append(factory())
+        return instance[0]
+
+    return getter
+
+
+@_lazy_singleton
+def get_ee_service() -> EarthEngineService:
+    """Return the process-wide EarthEngineService, creating it on first use."""
+    return EarthEngineService()
+
+
+@_lazy_singleton
+def get_ai_service() -> AIAssistantService:
+    """Return the process-wide AIAssistantService, creating it on first use."""
+    return AIAssistantService()
+
+
+@_lazy_singleton
+def get_report_service() -> ReportService:
+    """Return the process-wide ReportService, creating it on first use."""
+    return ReportService()
@@ -1,24 +1,100 @@
-import os
+import hashlib
+from threading import Lock
 from typing import Dict, Optional
 import groq
+from cachetools import TTLCache
 from config import Config
 import logging
 
 logger = logging.getLogger(__name__)
 
+SYSTEM_PROMPT = (
+    "You are an expert agricultural advisor specializing in precision farming. "
+    "You analyze field data from satellite imagery and provide actionable recommendations to farmers. "
+    "Your advice should be practical, specific, and focused on improving crop yields while optimizing resource usage."
+)
+_SYSTEM_MSG = {"role": "system", "content": SYSTEM_PROMPT}
+# Stands in for SYSTEM_PROMPT in cache keys; bump whenever the prompt changes
+_SYSTEM_PROMPT_VERSION = 1
+
+# Completions for identical prompts, reused instead of another LLM round-trip
+_RECOMMENDATION_CACHE = TTLCache(maxsize=512, ttl=Config.GROQ_CACHE_TTL)
+_RECOMMENDATION_LOCK = Lock()
+
+# Output budget for short questions; open-ended requests get the full budget
+_SHORT_QUERY_CHARS = 80
+_SHORT_QUERY_MAX_TOKENS = 200
+_MAX_TOKENS = 800
+
+def _prompt_key(*parts) -> bytes:
+    """Hash the model, prompts and sampling settings of a completion request."""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(str(part).encode('utf-8'))
+        digest.update(b'\0')
+    return digest.digest()
+
 
 class AIAssistantService:
     """AI assistant that uses GROQ AI or falls back to a helpful message.
 
     Configure via environment variables:
     - GROQ_API_KEY: the API key for GROQ
-    - GROQ_MODEL: the model to use (defaults to "llama‑3.1‑8b‑instant")
+    - GROQ_MODEL: the model to use (defaults to "llama-3.1-8b-instant")
     """
 
+    __slots__ = ('client', 'model')
+
     def __init__(self):
         self.client = groq.Client(api_key=Config.GROQ_API_KEY)
         self.model = Config.GROQ_MODEL
 
+    def _chat_request(self, field_data: Dict, query: Optional[str] = None) -> Dict:
+        """Build the chat completion arguments for a field and optional question."""
+        field_summary = self._prepare_field_summary(field_data)
+
+        user_message = (
+            f"Based on the following field analysis data:\n\n{field_summary}\n\n"
+            + (f"User Question: {query}" if query else "Please provide comprehensive recommendations for improving crop health and yield.")
+        )
+
+        chat_request = {
+            'model': self.model,
+            'messages': [
+                _SYSTEM_MSG,
+                {
+                    "role": "user",
+                    "content": user_message
+                }
+            ],
+            'temperature': 0.7,
+            'max_tokens': _MAX_TOKENS
+        }
+        if query and len(query) < _SHORT_QUERY_CHARS:
+            chat_request['max_tokens'] = _SHORT_QUERY_MAX_TOKENS
+        return chat_request
+
+    @staticmethod
+    def _request_key(chat_request: Dict) -> bytes:
+        return _prompt_key(
+            chat_request['model'],
+            _SYSTEM_PROMPT_VERSION,
+            chat_request['messages'][-1]['content'],
+            chat_request['temperature'],
+            chat_request['max_tokens']
+        )
+
+    @staticmethod
+    def _completion_text(chat_completion, key: bytes) -> str:
+        """Extract the reply from a completion, caching it for identical prompts."""
+        if chat_completion.choices and len(chat_completion.choices) > 0:
+            content = chat_completion.choices[0].message.content
+            with _RECOMMENDATION_LOCK:
+                _RECOMMENDATION_CACHE[key] = content
+            return content
+
+        return "No response generated from the AI model."
+
     def generate_recommendation(self, field_data: Dict, query: Optional[str] = None) -> str:
         """Generate smart agricultural recommendations based on field data using GROQ.
         
@@ -27,47 +103,22 @@ class AIAssistantService:
         if not self.client:
             return "AI Assistant is not configured. Please provide GROQ_API_KEY."
 
-        system_prompt = (
-            "You are an expert agricultural advisor specializing in precision farming. "
-            "You analyze field data from satellite imagery and provide actionable recommendations to farmers. "
-            "Your advice should be practical, specific, and focused on improving crop yields while optimizing resource usage."
-        )
-
-        field_summary = self._prepare_field_summary(field_data)
-
-        user_message = (
-            f"Based on the following field analysis data:\n\n{field_summary}\n\n"
-            + (f"User Question: {query}" if query else "Please provide comprehensive recommendations for improving crop health and yield.")
-        )
+        chat_request = self._chat_request(field_data, query)
+        key = self._request_key(chat_request)
+        with _RECOMMENDATION_LOCK:
+            cached = _RECOMMENDATION_CACHE.get(key)
+        if cached is not None:
+            return cached
 
         try:
             logger.debug("Making request to Groq API")
             
             # Using the official Groq client library
-            chat_completion = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": system_prompt
-                    },
-                    {
-                        "role": "user",
-                        "content": user_message
-                    }
-                ],
-                temperature=0.7,
-                max_tokens=800
-            )
+            chat_completion = self.client.chat.completions.create(**chat_request)
             
             logger.debug(f"Groq API response received")
             
-            # Get the response content
-            if chat_completion.choices and len(chat_completion.choices) > 0:
-                return chat_completion.choices[0].message.content
-                
-            return "No response generated from the AI model."
-            return resp.text
+            return self._completion_text(chat_completion, key)
         except Exception as e:
             logger.error(f"Error calling GROQ API: {e}")
             return f"Error generating recommendation: {str(e)}"
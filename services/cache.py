@@ -0,0 +1,145 @@
+import copy
+import ee
+import hashlib
+import logging
+import orjson
+from concurrent.futures import Future
+from functools import wraps
+from threading import RLock
+from cachetools import TTLCache
+from config import Config
+
+try:
+    import redis
+except ImportError:  # Redis is optional; without it results are cached per process
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+# Sorted keys make equal dicts encode identically
+_KEY_OPTIONS = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+_REDIS_PREFIX = 'greenpulse:analysis:'
+# A slow or unreachable Redis falls back to computing locally instead of stalling requests
+_REDIS_TIMEOUT = 0.25
+_redis_client = None
+_redis_lock = RLock()
+
+
+def _shared_cache():
+    """Return the Redis client shared by all workers, or None when not configured."""
+    global _redis_client
+    if _redis_client is None and Config.REDIS_URL and redis is not None:
+        with _redis_lock:
+            if _redis_client is None:
+                _redis_client = redis.Redis.from_url(
+                    Config.REDIS_URL,
+                    socket_timeout=_REDIS_TIMEOUT,
+                    socket_connect_timeout=_REDIS_TIMEOUT
+                )
+    return _redis_client
+
+
+def _shared_get(key: bytes):
+    client = _shared_cache()
+    if client is None:
+        return _MISSING
+    try:
+        payload = client.get(_REDIS_PREFIX + key.hex())
+    except redis.RedisError as e:
+        logger.warning(f'Redis read failed, computing analysis locally: {e}')
+        return _MISSING
+    return _MISSING if payload is None else orjson.loads(payload)
+
+
+def _shared_set(key: bytes, value, ttl: int) -> None:
+    client = _shared_cache()
+    if client is None:
+        return
+    try:
+        client.setex(_REDIS_PREFIX + key.hex(), ttl, orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY))
+    except (redis.RedisError, TypeError) as e:
+        logger.warning(f'Redis write failed, result cached locally only: {e}')
+
+
+def _key_part(value) -> bytes:
+    """Encode one argument of a cached call into stable bytes."""
+    if isinstance(value, ee.ComputedObject):
+        # Earth Engine objects are lazy graphs; their serialized form identifies them.
+        return value.serialize().encode('utf-8')
+    return orjson.dumps(value, default=str, option=_KEY_OPTIONS)
+
+
+def analysis_cache_key(name: str, *args, **kwargs) -> bytes:
+    """Build a compact cache key from a method name and its arguments."""
+    digest = hashlib.blake2b(name.encode('utf-8'), digest_size=16)
+    for value in args:
+        digest.update(b'\0')
+        digest.update(_key_part(value))
+    for key in sorted(kwargs):
+        digest.update(b'\0' + key.encode('utf-8') + b'=')
+        digest.update(_key_part(kwargs[key]))
+    return digest.digest()
+
+
+def cached_analysis(ttl: int, maxsize: int = 1024, cacheable=None):
+    """Memoize an EarthEngineService method on its arguments for ``ttl`` seconds.
+
+    Identical polygons and date ranges produce identical Earth Engine results, so a
+    dashboard polling the same field is served from memory instead of a new round-trip.
+    When ``REDIS_URL`` is set, results are also shared across workers through Redis.
+    Concurrent misses on the same key wait for the first caller's computation
+    instead of each starting their own. Results failing the optional ``cacheable``
+    predicate are returned but not stored. Every caller gets its own copy of the result.
+    """
+    def decorator(method):
+        name = method.__qualname__
+        cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        in_flight = {}
+        lock = RLock()
+
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            key = analysis_cache_key(name, *args, **kwargs)
+            with lock:
+                result = cache.get(key, _MISSING)
+                if result is _MISSING:
+                    future = in_flight.get(key)
+                    leader = future is None
+                    if leader:
+                        future = in_flight[key] = Future()
+
+            if result is not _MISSING:
+                return copy.deepcopy(result)
+            if not leader:
+                return copy.deepcopy(future.result())
+
+            store = False
+            try:
+                result = _shared_get(key)
+                if result is _MISSING:
+                    result = method(self, *args, **kwargs)
+                    store = cacheable is None or cacheable(result)
+                    if store:
+                        _shared_set(key, result, ttl)
+                else:
+                    store = True
+            except BaseException as e:
+                future.set_exception(e)
+                with lock:
+                    in_flight.pop(key, None)
+                raise
+
+            # The cache and waiters share a private snapshot, so callers may mutate what they get
+            snapshot = copy.deepcopy(result)
+            future.set_result(snapshot)
+            with lock:
+                in_flight.pop(key, None)
+                if store:
+                    cache[key] = snapshot
+            return result
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
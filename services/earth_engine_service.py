@@ -1,21 +1,148 @@
 import ee
+import requests
 from typing import Dict, List, Tuple, Optional
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_EXCEPTION
+from datetime import date, timedelta
+from dateutil.relativedelta import relativedelta
+from functools import lru_cache
 import numpy as np
 import json
 import os
 import tempfile
 import logging
 from config import Config
+from .cache import cached_analysis
 
 logger = logging.getLogger(__name__)
 
+# Earth Engine calls are network-bound round-trips, so independent analyses are
+# fanned out on a shared pool instead of being awaited one after another.
+_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix='ee-analysis')
+# Earth Engine endpoint for programmatic workloads with many concurrent requests
+_HIGH_VOLUME_URL = 'https://earthengine-highvolume.googleapis.com'
+# Pooled HTTPS connections kept to Earth Engine; requests' default of 10 is
+# smaller than the analysis pool plus concurrent request threads
+_HTTP_POOL_SIZE = 32
+# Seconds the concurrent fallback waits for all analyses before giving up
+_ANALYSIS_TIMEOUT = 60
+
+def _widen_connection_pool() -> None:
+    """Enlarge the connection pool of the requests session Earth Engine sends every call through."""
+    try:
+        session = ee.data._get_state().requests_session
+    except AttributeError:
+        logger.debug("Earth Engine session not found; keeping the default connection pool")
+        return
+    if session is not None:
+        session.mount('https://', requests.adapters.HTTPAdapter(pool_maxsize=_HTTP_POOL_SIZE))
+
+def _complete_report(report: Dict) -> bool:
+    """Whether a field report has no per-analysis errors and is safe to cache."""
+    return not any(isinstance(section, dict) and 'error' in section for section in report.values())
+
+def _round_coordinates(coordinates, digits: int = 6):
+    """Round every position in a nested coordinate list into hashable nested tuples."""
+    if isinstance(coordinates, (list, tuple)):
+        return tuple(_round_coordinates(value, digits) for value in coordinates)
+    return round(coordinates, digits)
+
+@lru_cache(maxsize=1024)
+def _polygon(coordinates: Tuple) -> ee.Geometry:
+    """Build (once per distinct polygon) the Earth Engine geometry for rounded coordinates."""
+    return ee.Geometry.Polygon(coordinates)
+
+# Sentinel-2 bands used by the analyses, and the scene classification (SCL)
+# values masked out: cloud shadow, medium/high probability cloud and cirrus
+_S2_BANDS = ['B2', 'B3', 'B4', 'B8', 'B11', 'B12']
+_SCL_CLOUD_CLASSES = (3, 8, 9, 10)
+
+def _mask_clouds(image: ee.Image) -> ee.Image:
+    """Mask cloudy pixels of a Sentinel-2 SR image using its SCL band."""
+    scl = image.select('SCL')
+    clear = scl.neq(_SCL_CLOUD_CLASSES[0])
+    for scl_class in _SCL_CLOUD_CLASSES[1:]:
+        clear = clear.And(scl.neq(scl_class))
+    return image.select(_S2_BANDS).updateMask(clear)
+
+# Statistics reduced per analysis, combined with shared inputs into one reducer
+_MEAN_ONLY = ('mean',)
+_NDVI_STATS = Config.STATS_REDUCER_SPEC
+_WATER_STRESS_STATS = ('mean', 'minMax', 'count', 'sum')
+_DISEASE_RISK_STATS = Config.STATS_REDUCER_SPEC + ('count', 'sum')
+
+@lru_cache(maxsize=None)
+def _combined_reducer(names: Tuple[str, ...]) -> ee.Reducer:
+    """Build (once, after Earth Engine is initialized) a combined ee.Reducer from reducer names."""
+    reducer = getattr(ee.Reducer, names[0])()
+    for name in names[1:]:
+        reducer = reducer.combine(getattr(ee.Reducer, name)(), '', True)
+    return reducer
+
+# Reduction scale in metres by field area: native 10 m below 1 km², coarser
+# for larger fields where per-pixel precision no longer changes the statistics
+_SCALE_TIERS_KM2 = ((1, 10), (10, 20), (100, 30))
+_MAX_SCALE = 60
+
+@lru_cache(maxsize=1024)
+def _adaptive_scale(geometry: ee.Geometry) -> ee.Number:
+    """Build (once per geometry) a server-side reduction scale from the field's area."""
+    area_km2 = geometry.area(maxError=1).divide(1e6)
+    scale = _MAX_SCALE
+    for limit, tier_scale in reversed(_SCALE_TIERS_KM2):
+        scale = ee.Algorithms.If(area_km2.lt(limit), tier_scale, scale)
+    return ee.Number(scale)
+
+# Net NDVI change across a series that counts as a trend rather than noise
+_TREND_THRESHOLD = 0.05
+
+
+def _ndvi_trend(time_series: List[Dict]) -> str:
+    """Classify an NDVI time series as improving, declining or stable.
+
+    Longer series use the least-squares slope against acquisition date, so a single
+    noisy endpoint cannot flip the trend and irregular revisits are weighted by
+    real elapsed time. Very short ones fall back to comparing first and last values.
+    """
+    count = len(time_series)
+    if count < 2:
+        return 'insufficient_data'
+
+    days = np.array([point['date'] for point in time_series], dtype='datetime64[D]').astype(np.float64)
+    days -= days[0]
+    if count < 4 or not days[-1]:
+        change = time_series[-1]['ndvi'] - time_series[0]['ndvi']
+    else:
+        values = np.fromiter((point['ndvi'] for point in time_series), dtype=np.float64, count=count)
+        slope = np.polyfit(days, values, 1)[0]
+        change = slope * days[-1]
+
+    return _classify_ndvi_change(change)
+
+def _shift_date(value: str, days: int) -> str:
+    """Shift a YYYY-MM-DD date string by a number of days."""
+    return (date.fromisoformat(value) + timedelta(days=days)).isoformat()
+
+def _shift_years(value: str, years: int) -> str:
+    """Shift a YYYY-MM-DD date string by calendar years; Feb 29 falls back to Feb 28."""
+    return (date.fromisoformat(value) + relativedelta(years=years)).isoformat()
+
+def _classify_ndvi_change(change: float) -> str:
+    """Map a net NDVI change over a series onto a trend label."""
+    if change > _TREND_THRESHOLD:
+        return 'improving'
+    if change < -_TREND_THRESHOLD:
+        return 'declining'
+    return 'stable'
+
 class EarthEngineService:
+    __slots__ = ('initialized',)
+
     def __init__(self):
         self.initialized = False
         
     def initialize(self, project_id: Optional[str] = None):
         """Initialize Google Earth Engine with authentication."""
+        url = _HIGH_VOLUME_URL if Config.GEE_HIGH_VOLUME else None
         try:
             service_account_key = os.getenv('GEE_SERVICE_ACCOUNT_KEY')
 
@@ -32,7 +159,8 @@ class EarthEngineService:
                             json.dump(key_data, f)
 
                         credentials = ee.ServiceAccountCredentials(service_account_email, tmp_file)
-                        ee.Initialize(credentials, project=project_id)
+                        ee.Initialize(credentials, url=url, project=project_id)
+                        _widen_connection_pool()
 
                         logger.info(f"Earth Engine initialized with service account: {service_account_email}")
                         self.initialized = True
@@ -49,9 +177,10 @@ class EarthEngineService:
                     logger.info("Falling back to user authentication...")
             
             if project_id:
-                ee.Initialize(project=project_id)
+                ee.Initialize(url=url, project=project_id)
             else:
-                ee.Initialize()
+                ee.Initialize(url=url)
+            _widen_connection_pool()
             self.initialized = True
             return True
         except Exception as e:
@@ -59,112 +188,97 @@ class EarthEngineService:
             return False
     
     def get_field_bounds(self, coordinates: List[List[float]]) -> ee.Geometry:
-        """Convert coordinates to Earth Engine geometry."""
-        return ee.Geometry.Polygon(coordinates)
+        """Convert coordinates to Earth Engine geometry.
+
+        Positions are rounded to 6 decimal places (about 10 cm) so the same field
+        always serializes identically and shares cached results. Geometries are
+        immutable, so one instance per polygon is reused across requests and threads.
+        """
+        return _polygon(_round_coordinates(coordinates))
     
     def calculate_ndvi(self, image: ee.Image) -> ee.Image:
         """Calculate Normalized Difference Vegetation Index."""
-        nir = image.select('B8')
-        red = image.select('B4')
-        ndvi = nir.subtract(red).divide(nir.add(red)).rename('NDVI')
-        return ndvi
+        return image.normalizedDifference(['B8', 'B4']).rename('NDVI')
     
+    # Composites are immutable lazy graphs, so one instance per (field, window) is
+    # shared by every analysis and map that asks for it.
+    @lru_cache(maxsize=64)
     def get_sentinel2_image(self, geometry: ee.Geometry, start_date: str, end_date: str) -> ee.Image:
         """Get cloud-filtered Sentinel-2 imagery for a specific time period."""
         collection = (ee.ImageCollection('COPERNICUS/S2_SR_HARMONIZED')
                      .filterBounds(geometry)
                      .filterDate(start_date, end_date)
                      .filter(ee.Filter.lt('CLOUDY_PIXEL_PERCENTAGE', 20))
-                     .select(['B2', 'B3', 'B4', 'B8', 'B11', 'B12']))
+                     .select(_S2_BANDS + ['SCL'])
+                     .map(_mask_clouds))
         
         return collection.median()
     
+    @lru_cache(maxsize=64)
+    def build_composite(self, geometry: ee.Geometry, start_date: str, end_date: str) -> ee.Image:
+        """Build one Sentinel-2 composite with NDVI and NDMI bands attached.
+
+        The image stays lazy, so analyses sharing it are evaluated against a single
+        server-side composite instead of each re-querying the collection.
+        """
+        image = self.get_sentinel2_image(geometry, start_date, end_date)
+        return image.addBands([self.calculate_ndvi(image), self.calculate_soil_moisture_index(image)])
+    
+    def _ndvi_statistics_expr(self, ndvi_image: ee.Image, geometry: ee.Geometry) -> ee.Dictionary:
+        """Build the server-side NDVI statistics for a given area."""
+        return ndvi_image.reduceRegion(
+            reducer=_combined_reducer(_NDVI_STATS),
+            geometry=geometry,
+            scale=_adaptive_scale(geometry),
+            maxPixels=1e9
+        )
+    
+    @cached_analysis(ttl=Config.ANALYSIS_CACHE_TTL)
     def get_ndvi_statistics(self, ndvi_image: ee.Image, geometry: ee.Geometry) -> Dict:
         """Calculate NDVI statistics for a given area."""
-        stats = ndvi_image.reduceRegion(
-            reducer=ee.Reducer.mean().combine(
-                ee.Reducer.minMax(), '', True
-            ).combine(
-                ee.Reducer.stdDev(), '', True
-            ),
+        return self._ndvi_statistics_expr(ndvi_image, geometry).getInfo()
+    
+    def _productivity_zones_expr(self, ndvi_image: ee.Image, geometry: ee.Geometry) -> ee.Dictionary:
+        """Build the server-side pixel histogram of productivity zones."""
+        # 0 = low, 1 = medium, 2 = high; the band keeps the NDVI mask, so the
+        # histogram covers exactly the valid pixels in one reduction pass.
+        thresholds = Config.NDVI_THRESHOLDS
+        zone = (ndvi_image.gte(thresholds['medium'])
+                .add(ndvi_image.gte(thresholds['high']))
+                .rename('zone'))
+        return zone.reduceRegion(
+            reducer=ee.Reducer.frequencyHistogram(),
             geometry=geometry,
-            scale=10,
+            scale=_adaptive_scale(geometry),
             maxPixels=1e9
         )
-        
-        return stats.getInfo()
+    
+    @staticmethod
+    def _productivity_zones_result(values: Dict) -> Dict:
+        """Turn a fetched zone histogram into percentages, guarding against missing data."""
+        histogram = values.get('zone') or {}
+        total_pixels = sum(histogram.values())
+        if not total_pixels:
+            logger.warning('No valid pixels returned for productivity classification; returning zeros')
+            return {
+                'high_productivity_percent': 0.0,
+                'medium_productivity_percent': 0.0,
+                'low_productivity_percent': 0.0,
+                'note': 'no_valid_pixels'
+            }
+
+        return {
+            'high_productivity_percent': (histogram.get('2', 0) / total_pixels) * 100,
+            'medium_productivity_percent': (histogram.get('1', 0) / total_pixels) * 100,
+            'low_productivity_percent': (histogram.get('0', 0) / total_pixels) * 100
+        }
     
     def classify_productivity_zones(self, ndvi_image: ee.Image, geometry: ee.Geometry) -> Dict:
         """Classify field into high, medium, low productivity zones based on NDVI."""
-        high_zone = ndvi_image.gte(Config.NDVI_THRESHOLDS['high'])
-        medium_zone = ndvi_image.gte(Config.NDVI_THRESHOLDS['medium']).And(
-            ndvi_image.lt(Config.NDVI_THRESHOLDS['high'])
-        )
-        low_zone = ndvi_image.lt(Config.NDVI_THRESHOLDS['medium'])
         try:
-            total_pixels_obj = ndvi_image.reduceRegion(
-                reducer=ee.Reducer.count(),
-                geometry=geometry,
-                scale=10,
-                maxPixels=1e9
-            ).get('NDVI')
-
-            high_pixels_obj = high_zone.reduceRegion(
-                reducer=ee.Reducer.sum(),
-                geometry=geometry,
-                scale=10,
-                maxPixels=1e9
-            ).get('NDVI')
-
-            medium_pixels_obj = medium_zone.reduceRegion(
-                reducer=ee.Reducer.sum(),
-                geometry=geometry,
-                scale=10,
-                maxPixels=1e9
-            ).get('NDVI')
-
-            low_pixels_obj = low_zone.reduceRegion(
-                reducer=ee.Reducer.sum(),
-                geometry=geometry,
-                scale=10,
-                maxPixels=1e9
-            ).get('NDVI')
-
-            # Fetch server-side values and guard against divide-by-zero / missing data
-            try:
-                total_pixels = ee.Number(total_pixels_obj).getInfo() or 0
-            except Exception:
-                total_pixels = 0
-
-            try:
-                high_pixels = ee.Number(high_pixels_obj).getInfo() or 0
-            except Exception:
-                high_pixels = 0
-
-            try:
-                medium_pixels = ee.Number(medium_pixels_obj).getInfo() or 0
-            except Exception:
-                medium_pixels = 0
-
-            try:
-                low_pixels = ee.Number(low_pixels_obj).getInfo() or 0
-            except Exception:
-                low_pixels = 0
-
-            if not total_pixels:
-                logger.warning('No valid pixels returned for productivity classification; returning zeros')
-                return {
-                    'high_productivity_percent': 0.0,
-                    'medium_productivity_percent': 0.0,
-                    'low_productivity_percent': 0.0,
-                    'note': 'no_valid_pixels'
-                }
-
-            return {
-                'high_productivity_percent': (high_pixels / total_pixels) * 100,
-                'medium_productivity_percent': (medium_pixels / total_pixels) * 100,
-                'low_productivity_percent': (low_pixels / total_pixels) * 100
-            }
+            # The whole zone histogram comes back in a single round-trip
+            values = self._productivity_zones_expr(ndvi_image, geometry).getInfo()
+            return self._productivity_zones_result(values)
         except Exception as e:
             logger.error(f'Error classifying productivity zones: {e}')
             return {
@@ -176,215 +290,251 @@ class EarthEngineService:
     
     def calculate_soil_moisture_index(self, image: ee.Image) -> ee.Image:
         """Calculate soil moisture index using SWIR bands."""
-        swir1 = image.select('B11')
-        swir2 = image.select('B12')
-        nir = image.select('B8')
-        
-        ndmi = nir.subtract(swir1).divide(nir.add(swir1)).rename('NDMI')
-        
-        return ndmi
+        return image.normalizedDifference(['B8', 'B11']).rename('NDMI')
     
-    def detect_water_stress(self, geometry: ee.Geometry, start_date: str, end_date: str) -> Dict:
-        """Detect water stress areas using soil moisture indices."""
-        image = self.get_sentinel2_image(geometry, start_date, end_date)
-        ndmi = self.calculate_soil_moisture_index(image)
-        
-        stats = ndmi.reduceRegion(
-            reducer=ee.Reducer.mean().combine(
-                ee.Reducer.minMax(), '', True
-            ),
+    def _water_stress_expr(self, geometry: ee.Geometry, start_date: str, end_date: str, composite: Optional[ee.Image] = None) -> ee.Dictionary:
+        """Build the server-side moisture statistics and stressed-pixel counts."""
+        if composite is None:
+            composite = self.build_composite(geometry, start_date, end_date)
+        ndmi = composite.select('NDMI')
+        water_stress = ndmi.lt(Config.WATER_STRESS_THRESHOLD).rename('stressed')
+
+        values = ndmi.addBands(water_stress).reduceRegion(
+            reducer=_combined_reducer(_WATER_STRESS_STATS),
             geometry=geometry,
-            scale=10,
+            scale=_adaptive_scale(geometry),
             maxPixels=1e9
-        ).getInfo()
-        
-        water_stress = ndmi.lt(Config.WATER_STRESS_THRESHOLD)
-        try:
-            total_pixels_obj = ndmi.reduceRegion(
-                reducer=ee.Reducer.count(),
-                geometry=geometry,
-                scale=10,
-                maxPixels=1e9
-            ).get('NDMI')
-
-            stress_pixels_obj = water_stress.reduceRegion(
-                reducer=ee.Reducer.sum(),
-                geometry=geometry,
-                scale=10,
-                maxPixels=1e9
-            ).get('NDMI')
-
-            try:
-                total_pixels = ee.Number(total_pixels_obj).getInfo() or 0
-            except Exception:
-                total_pixels = 0
+        )
 
-            try:
-                stress_pixels = ee.Number(stress_pixels_obj).getInfo() or 0
-            except Exception:
-                stress_pixels = 0
+        return ee.Dictionary({
+            'stats': values,
+            'total': values.get('NDMI_count', 0),
+            'stressed': values.get('stressed_sum', 0)
+        })
+    
+    @staticmethod
+    def _water_stress_result(values: Dict) -> Dict:
+        """Summarize fetched moisture statistics into a water stress report."""
+        stats = values.get('stats') or {}
+        total_pixels = values.get('total') or 0
 
-            if not total_pixels:
-                logger.warning('No valid pixels returned for water stress detection; returning defaults')
-                stress_percent = 0.0
-            else:
-                stress_percent = (stress_pixels / total_pixels) * 100
+        if not total_pixels:
+            logger.warning('No valid pixels returned for water stress detection; returning defaults')
+            stress_percent = 0.0
+        else:
+            stress_percent = ((values.get('stressed') or 0) / total_pixels) * 100
 
-            return {
-                'average_moisture_index': stats.get('NDMI_mean'),
-                'min_moisture_index': stats.get('NDMI_min'),
-                'max_moisture_index': stats.get('NDMI_max'),
-                'water_stress_area_percent': stress_percent,
-                'requires_irrigation': stress_percent > 30
-            }
-        except Exception as e:
-            logger.error(f'Error detecting water stress: {e}')
-            return {
-                'average_moisture_index': stats.get('NDMI_mean'),
-                'min_moisture_index': stats.get('NDMI_min'),
-                'max_moisture_index': stats.get('NDMI_max'),
-                'water_stress_area_percent': 0.0,
-                'requires_irrigation': False,
-                'error': str(e)
-            }
+        return {
+            'average_moisture_index': stats.get('NDMI_mean'),
+            'min_moisture_index': stats.get('NDMI_min'),
+            'max_moisture_index': stats.get('NDMI_max'),
+            'water_stress_area_percent': stress_percent,
+            'requires_irrigation': stress_percent > 30
+        }
     
-    def get_time_series_ndvi(self, geometry: ee.Geometry, start_date: str, end_date: str, interval_days: int = 10) -> List[Dict]:
-        """Get NDVI time series data for crop growth tracking."""
+    @cached_analysis(ttl=Config.ANALYSIS_CACHE_TTL)
+    def detect_water_stress(self, geometry: ee.Geometry, start_date: str, end_date: str) -> Dict:
+        """Detect water stress areas using soil moisture indices."""
+        values = self._water_stress_expr(geometry, start_date, end_date).getInfo()
+        return self._water_stress_result(values)
+    
+    def _time_series_expr(self, geometry: ee.Geometry, start_date: str, end_date: str) -> ee.FeatureCollection:
+        """Build the server-side per-image mean NDVI collection, with ``t`` in days since ``start_date``."""
+        start = ee.Date(start_date)
         collection = (ee.ImageCollection('COPERNICUS/S2_SR_HARMONIZED')
                      .filterBounds(geometry)
                      .filterDate(start_date, end_date)
-                     .filter(ee.Filter.lt('CLOUDY_PIXEL_PERCENTAGE', 20)))
+                     .filter(ee.Filter.lt('CLOUDY_PIXEL_PERCENTAGE', 20))
+                     .select(_S2_BANDS + ['SCL'])
+                     .map(_mask_clouds))
         
         def compute_ndvi(image):
             ndvi = self.calculate_ndvi(image)
             mean_ndvi = ndvi.reduceRegion(
-                reducer=ee.Reducer.mean(),
+                reducer=_combined_reducer(_MEAN_ONLY),
                 geometry=geometry,
-                scale=10,
+                scale=_adaptive_scale(geometry),
                 maxPixels=1e9
             ).get('NDVI')
             
             return ee.Feature(None, {
                 'date': image.date().format('YYYY-MM-dd'),
+                't': image.date().difference(start, 'day'),
                 'ndvi': mean_ndvi
             })
         
-        time_series = collection.map(compute_ndvi).getInfo()
-        
-        results = []
-        for feature in time_series['features']:
-            props = feature['properties']
-            if props.get('ndvi') is not None:
-                results.append({
-                    'date': props['date'],
-                    'ndvi': props['ndvi']
-                })
-        
-        return sorted(results, key=lambda x: x['date'])
+        return collection.map(compute_ndvi)
     
-    def detect_disease_risk(self, geometry: ee.Geometry, start_date: str, end_date: str) -> Dict:
-        """Detect potential disease and pest risks using vegetation anomalies."""
-        current_image = self.get_sentinel2_image(geometry, start_date, end_date)
-        current_ndvi = self.calculate_ndvi(current_image)
+    def _time_series_rows_expr(self, geometry: ee.Geometry, start_date: str, end_date: str) -> ee.Dictionary:
+        """Build date-sorted ``[date, ndvi]`` rows in one pass, far smaller on the wire than the features."""
+        return (self._time_series_expr(geometry, start_date, end_date)
+                .filter(ee.Filter.notNull(['ndvi']))
+                .sort('date')
+                .reduceColumns(ee.Reducer.toList(2), ['date', 'ndvi']))
+    
+    @staticmethod
+    def _time_series_result(rows: Dict) -> List[Dict]:
+        """Turn fetched ``[date, ndvi]`` rows into time series points."""
+        return [{'date': date, 'ndvi': ndvi} for date, ndvi in rows.get('list') or []]
+    
+    def _ndvi_trend_expr(self, geometry: ee.Geometry, start_date: str, end_date: str) -> ee.Dictionary:
+        """Build a server-side least-squares fit of NDVI against days since ``start_date``.
+
+        The span runs from the first to the last observation, and the first and last
+        NDVI values are included for the short-series fallback ``_ndvi_trend`` uses.
+        """
+        points = (self._time_series_expr(geometry, start_date, end_date)
+                  .filter(ee.Filter.notNull(['ndvi']))
+                  .sort('t'))
+        count = points.size()
+
+        return ee.Dictionary({
+            'count': count,
+            'span': ee.Algorithms.If(
+                count.gte(2),
+                ee.Number(points.aggregate_max('t')).subtract(points.aggregate_min('t')),
+                0
+            ),
+            'ends': ee.Algorithms.If(
+                count.gte(2),
+                points.reduceColumns(ee.Reducer.first().combine(ee.Reducer.last(), '', True), ['ndvi']),
+                None
+            ),
+            'fit': ee.Algorithms.If(
+                count.gte(4),
+                points.reduceColumns(ee.Reducer.linearFit(), ['t', 'ndvi']),
+                None
+            )
+        })
+    
+    @staticmethod
+    def _ndvi_trend_result(values: Dict) -> Dict:
+        """Classify a fetched NDVI fit into a trend and its slope per day, as ``_ndvi_trend`` does."""
+        count = values.get('count') or 0
+        span = values.get('span') or 0
+        ends = values.get('ends') or {}
+        fit = values.get('fit') or {}
+
+        if count >= 4 and span and fit.get('scale') is not None:
+            slope = fit['scale']
+            change = slope * span
+        elif count >= 2 and ends.get('first') is not None and ends.get('last') is not None:
+            change = ends['last'] - ends['first']
+            slope = change / span if span else None
+        else:
+            return {'trend': 'insufficient_data', 'slope_per_day': None}
+
+        return {
+            'trend': _classify_ndvi_change(change),
+            'slope_per_day': slope
+        }
+    
+    @cached_analysis(ttl=Config.ANALYSIS_CACHE_TTL)
+    def get_ndvi_trend(self, geometry: ee.Geometry, start_date: str, end_date: str) -> Dict:
+        """Get the NDVI trend over a period without transferring the full time series."""
+        values = self._ndvi_trend_expr(geometry, start_date, end_date).getInfo()
+        return self._ndvi_trend_result(values)
+    
+    @cached_analysis(ttl=Config.ANALYSIS_CACHE_TTL)
+    def get_time_series_ndvi(self, geometry: ee.Geometry, start_date: str, end_date: str, interval_days: int = 10) -> List[Dict]:
+        """Get NDVI time series data for crop growth tracking."""
+        rows = self._time_series_rows_expr(geometry, start_date, end_date).getInfo()
+        return self._time_series_result(rows)
+    
+    def _disease_risk_expr(self, geometry: ee.Geometry, start_date: str, end_date: str, composite: Optional[ee.Image] = None) -> ee.Dictionary:
+        """Build the server-side month-over-month NDVI change statistics."""
+        if composite is None:
+            composite = self.build_composite(geometry, start_date, end_date)
+        current_ndvi = composite.select('NDVI')
         
-        prev_start = (datetime.strptime(start_date, '%Y-%m-%d') - timedelta(days=30)).strftime('%Y-%m-%d')
-        prev_end = (datetime.strptime(end_date, '%Y-%m-%d') - timedelta(days=30)).strftime('%Y-%m-%d')
+        prev_start = _shift_date(start_date, -30)
+        prev_end = _shift_date(end_date, -30)
         
         previous_image = self.get_sentinel2_image(geometry, prev_start, prev_end)
         previous_ndvi = self.calculate_ndvi(previous_image)
         
         ndvi_change = current_ndvi.subtract(previous_ndvi)
-        
-        stats = ndvi_change.reduceRegion(
-            reducer=ee.Reducer.mean().combine(
-                ee.Reducer.minMax(), '', True
-            ).combine(
-                ee.Reducer.stdDev(), '', True
-            ),
+        anomaly = ndvi_change.lt(-Config.DISEASE_DETECTION_SENSITIVITY).rename('anomalous')
+
+        values = ndvi_change.addBands(anomaly).reduceRegion(
+            reducer=_combined_reducer(_DISEASE_RISK_STATS),
             geometry=geometry,
-            scale=10,
+            scale=_adaptive_scale(geometry),
             maxPixels=1e9
-        ).getInfo()
-        
-        anomaly_threshold = -Config.DISEASE_DETECTION_SENSITIVITY
-        anomaly = ndvi_change.lt(anomaly_threshold)
-        
-        try:
-            total_pixels_obj = ndvi_change.reduceRegion(
-                reducer=ee.Reducer.count(),
-                geometry=geometry,
-                scale=10,
-                maxPixels=1e9
-            ).get('NDVI')
+        )
 
-            anomaly_pixels_obj = anomaly.reduceRegion(
-                reducer=ee.Reducer.sum(),
-                geometry=geometry,
-                scale=10,
-                maxPixels=1e9
-            ).get('NDVI')
+        return ee.Dictionary({
+            'stats': values,
+            'total': values.get('NDVI_count', 0),
+            'anomalous': values.get('anomalous_sum', 0)
+        })
+    
+    @staticmethod
+    def _disease_risk_result(values: Dict) -> Dict:
+        """Classify fetched NDVI change statistics into a disease risk level."""
+        stats = values.get('stats') or {}
+        total_pixels = values.get('total') or 0
 
-            try:
-                total_pixels = ee.Number(total_pixels_obj).getInfo() or 0
-            except Exception:
-                total_pixels = 0
+        if not total_pixels:
+            logger.warning('No valid pixels returned for disease detection; returning low risk')
+            anomaly_percent = 0.0
+        else:
+            anomaly_percent = ((values.get('anomalous') or 0) / total_pixels) * 100
 
-            try:
-                anomaly_pixels = ee.Number(anomaly_pixels_obj).getInfo() or 0
-            except Exception:
-                anomaly_pixels = 0
+        risk_level = 'low'
+        if anomaly_percent > 15:
+            risk_level = 'high'
+        elif anomaly_percent > 5:
+            risk_level = 'medium'
 
-            if not total_pixels:
-                logger.warning('No valid pixels returned for disease detection; returning low risk')
-                anomaly_percent = 0.0
-            else:
-                anomaly_percent = (anomaly_pixels / total_pixels) * 100
+        return {
+            'ndvi_change_mean': stats.get('NDVI_mean'),
+            'ndvi_change_min': stats.get('NDVI_min'),
+            'ndvi_change_max': stats.get('NDVI_max'),
+            'ndvi_change_stddev': stats.get('NDVI_stdDev'),
+            'anomaly_area_percent': anomaly_percent,
+            'risk_level': risk_level,
+            'alert': risk_level in ['medium', 'high']
+        }
+    
+    @cached_analysis(ttl=Config.ANALYSIS_CACHE_TTL)
+    def detect_disease_risk(self, geometry: ee.Geometry, start_date: str, end_date: str) -> Dict:
+        """Detect potential disease and pest risks using vegetation anomalies."""
+        values = self._disease_risk_expr(geometry, start_date, end_date).getInfo()
+        return self._disease_risk_result(values)
+    
+    @staticmethod
+    def _historical_window(current_start: str, current_end: str, years_back: int) -> Tuple[str, str]:
+        """Shift the current season's dates back by whole years."""
+        hist_start = _shift_years(current_start, -years_back)
+        hist_end = _shift_years(current_end, -years_back)
+        return hist_start, hist_end
+    
+    def _historical_comparison_expr(self, geometry: ee.Geometry, current_start: str, current_end: str, years_back: int = 1, composite: Optional[ee.Image] = None) -> ee.Dictionary:
+        """Build the server-side NDVI statistics for the current and historical seasons."""
+        hist_start, hist_end = self._historical_window(current_start, current_end, years_back)
 
-            risk_level = 'low'
-            if anomaly_percent > 15:
-                risk_level = 'high'
-            elif anomaly_percent > 5:
-                risk_level = 'medium'
+        if composite is None:
+            composite = self.build_composite(geometry, current_start, current_end)
+        current_ndvi = composite.select('NDVI')
+        historical_ndvi = self.calculate_ndvi(self.get_sentinel2_image(geometry, hist_start, hist_end))
 
-            return {
-                'ndvi_change_mean': stats.get('NDVI_mean'),
-                'ndvi_change_min': stats.get('NDVI_min'),
-                'ndvi_change_max': stats.get('NDVI_max'),
-                'ndvi_change_stddev': stats.get('NDVI_stdDev'),
-                'anomaly_area_percent': anomaly_percent,
-                'risk_level': risk_level,
-                'alert': risk_level in ['medium', 'high']
-            }
-        except Exception as e:
-            logger.error(f'Error detecting disease risk: {e}')
-            return {
-                'ndvi_change_mean': stats.get('NDVI_mean'),
-                'ndvi_change_min': stats.get('NDVI_min'),
-                'ndvi_change_max': stats.get('NDVI_max'),
-                'ndvi_change_stddev': stats.get('NDVI_stdDev'),
-                'anomaly_area_percent': 0.0,
-                'risk_level': 'low',
-                'alert': False,
-                'error': str(e)
-            }
+        return ee.Dictionary({
+            'current': self._ndvi_statistics_expr(current_ndvi, geometry),
+            'historical': self._ndvi_statistics_expr(historical_ndvi, geometry)
+        })
     
-    def compare_historical_seasons(self, geometry: ee.Geometry, current_start: str, current_end: str, years_back: int = 1) -> Dict:
-        """Compare current season with historical data."""
-        current_image = self.get_sentinel2_image(geometry, current_start, current_end)
-        current_ndvi = self.calculate_ndvi(current_image)
+    def _historical_comparison_result(self, values: Dict, current_start: str, current_end: str, years_back: int = 1) -> Dict:
+        """Compare fetched current and historical NDVI statistics."""
+        hist_start, hist_end = self._historical_window(current_start, current_end, years_back)
+        current_stats = values.get('current') or {}
+        historical_stats = values.get('historical') or {}
         
-        current_stats = self.get_ndvi_statistics(current_ndvi, geometry)
-        
-        hist_start = (datetime.strptime(current_start, '%Y-%m-%d') - timedelta(days=365*years_back)).strftime('%Y-%m-%d')
-        hist_end = (datetime.strptime(current_end, '%Y-%m-%d') - timedelta(days=365*years_back)).strftime('%Y-%m-%d')
-        
-        historical_image = self.get_sentinel2_image(geometry, hist_start, hist_end)
-        historical_ndvi = self.calculate_ndvi(historical_image)
-        
-        historical_stats = self.get_ndvi_statistics(historical_ndvi, geometry)
-        
-        ndvi_diff = current_stats.get('NDVI_mean', 0) - historical_stats.get('NDVI_mean', 0)
-        percent_change = (ndvi_diff / historical_stats.get('NDVI_mean', 1)) * 100 if historical_stats.get('NDVI_mean') else 0
+        # A window with no clear pixels reduces to a None mean; treat it as missing
+        current_mean = current_stats.get('NDVI_mean') or 0
+        historical_mean = historical_stats.get('NDVI_mean') or 0
+        ndvi_diff = current_mean - historical_mean
+        percent_change = (ndvi_diff / historical_mean) * 100 if historical_mean else 0
         
         return {
             'current_season': {
@@ -407,3 +557,132 @@ class EarthEngineService:
                 'performance': 'better' if ndvi_diff > 0 else 'worse' if ndvi_diff < 0 else 'similar'
             }
         }
+    
+    @cached_analysis(ttl=Config.HISTORICAL_CACHE_TTL)
+    def compare_historical_seasons(self, geometry: ee.Geometry, current_start: str, current_end: str, years_back: int = 1) -> Dict:
+        """Compare current season with historical data."""
+        values = self._historical_comparison_expr(geometry, current_start, current_end, years_back).getInfo()
+        return self._historical_comparison_result(values, current_start, current_end, years_back)
+    
+    @cached_analysis(ttl=Config.ANALYSIS_CACHE_TTL, cacheable=_complete_report)
+    def analyze_field(self, geometry: ee.Geometry, start_date: str, end_date: str, series_start_date: Optional[str] = None, include_time_series: bool = True, raise_exceptions: bool = True) -> Dict:
+        """Run every field analysis in one Earth Engine round-trip.
+
+        The current-period composite is built once and shared, and all analyses are
+        composed into a single server-side dictionary fetched with one getInfo call.
+        If that combined request fails, including on a transport error, the analyses
+        are retried individually and concurrently. Without ``include_time_series``
+        only the server-side NDVI trend fit is returned for crop growth. Without
+        ``raise_exceptions`` an analysis that fails to fetch or parse is reported as
+        ``{'error': ...}`` and the others are still returned; such partial reports
+        are not cached.
+        """
+        series_start_date = series_start_date or start_date
+        composite = self.build_composite(geometry, start_date, end_date)
+        ndvi = composite.select('NDVI')
+        growth_key = 'time_series' if include_time_series else 'ndvi_trend'
+        growth_expr = self._time_series_rows_expr if include_time_series else self._ndvi_trend_expr
+        growth_result = self._time_series_result if include_time_series else self._ndvi_trend_result
+
+        try:
+            values = ee.Dictionary({
+                'productivity_zones': self._productivity_zones_expr(ndvi, geometry),
+                'ndvi_stats': self._ndvi_statistics_expr(ndvi, geometry),
+                'water_stress': self._water_stress_expr(geometry, start_date, end_date, composite),
+                growth_key: growth_expr(geometry, series_start_date, end_date),
+                'disease_risk': self._disease_risk_expr(geometry, start_date, end_date, composite),
+                'historical_comparison': self._historical_comparison_expr(geometry, start_date, end_date, composite=composite)
+            }).getInfo()
+        except (ee.EEException, requests.RequestException, OSError) as e:
+            # Transport failures (timeouts, dropped connections) get the same retry as EE errors
+            logger.warning(f'Combined field analysis failed, retrying analyses individually: {e}')
+            return self._analyze_field_concurrently(ndvi, geometry, start_date, end_date, series_start_date, include_time_series, raise_exceptions)
+
+        parsers = {
+            'productivity_zones': self._productivity_zones_result,
+            'water_stress': self._water_stress_result,
+            growth_key: growth_result,
+            'disease_risk': self._disease_risk_result,
+            'historical_comparison': lambda section: self._historical_comparison_result(section, start_date, end_date)
+        }
+        results = {'ndvi_stats': values.get('ndvi_stats')}
+        for name, parse in parsers.items():
+            try:
+                results[name] = parse(values[name])
+            except Exception as e:
+                if raise_exceptions:
+                    raise
+                logger.error(f'Field analysis {name} failed: {e}')
+                results[name] = {'error': str(e)}
+        return self._field_report(results)
+    
+    def _analyze_field_concurrently(self, ndvi: ee.Image, geometry: ee.Geometry, start_date: str, end_date: str, series_start_date: str, include_time_series: bool = True, raise_exceptions: bool = True) -> Dict:
+        """Run each analysis as its own round-trip, fanned out on the shared pool.
+
+        The first failure cancels whatever has not started yet and is re-raised;
+        analyses still running after ``_ANALYSIS_TIMEOUT`` seconds raise TimeoutError.
+        With ``raise_exceptions=False`` every analysis is awaited and failures are
+        reported in place instead.
+        """
+        futures = {
+            'productivity_zones': _EXECUTOR.submit(self.classify_productivity_zones, ndvi, geometry),
+            'ndvi_stats': _EXECUTOR.submit(self.get_ndvi_statistics, ndvi, geometry),
+            'water_stress': _EXECUTOR.submit(self.detect_water_stress, geometry, start_date, end_date),
+            'disease_risk': _EXECUTOR.submit(self.detect_disease_risk, geometry, start_date, end_date),
+            'historical_comparison': _EXECUTOR.submit(self.compare_historical_seasons, geometry, start_date, end_date)
+        }
+        if include_time_series:
+            futures['time_series'] = _EXECUTOR.submit(self.get_time_series_ndvi, geometry, series_start_date, end_date)
+        else:
+            futures['ndvi_trend'] = _EXECUTOR.submit(self.get_ndvi_trend, geometry, series_start_date, end_date)
+
+        if not raise_exceptions:
+            return self._field_report(self._collect_results(futures))
+
+        done, pending = wait(futures.values(), timeout=_ANALYSIS_TIMEOUT, return_when=FIRST_EXCEPTION)
+        if pending:
+            for future in pending:
+                future.cancel()
+            failed = [name for name, future in futures.items() if future in done and future.exception()]
+            if failed:
+                logger.error(f'Field analysis failed in: {", ".join(failed)}')
+                futures[failed[0]].result()
+            timed_out = [name for name, future in futures.items() if future in pending]
+            raise TimeoutError(f'Field analysis timed out after {_ANALYSIS_TIMEOUT}s waiting for: {", ".join(timed_out)}')
+
+        return self._field_report({name: future.result() for name, future in futures.items()})
+    
+    @staticmethod
+    def _collect_results(futures: Dict) -> Dict:
+        """Wait for every analysis, replacing failures and timeouts with an error entry."""
+        _, pending = wait(futures.values(), timeout=_ANALYSIS_TIMEOUT)
+        results = {}
+        for name, future in futures.items():
+            if future in pending:
+                future.cancel()
+                results[name] = {'error': f'Timed out after {_ANALYSIS_TIMEOUT}s'}
+            elif future.exception():
+                logger.error(f'Field analysis {name} failed: {future.exception()}')
+                results[name] = {'error': str(future.exception())}
+            else:
+                results[name] = future.result()
+        return results
+    
+    @staticmethod
+    def _field_report(results: Dict) -> Dict:
+        """Arrange per-analysis results into the combined field report."""
+        if isinstance(results.get('time_series'), list):
+            crop_growth = {
+                'time_series': results['time_series'],
+                'trend': _ndvi_trend(results['time_series'])
+            }
+        else:
+            crop_growth = results.get('ndvi_trend', results.get('time_series'))
+
+        return {
+            'yield_prediction': {**results['productivity_zones'], 'ndvi_stats': results['ndvi_stats']},
+            'water_stress': results['water_stress'],
+            'crop_growth': crop_growth,
+            'disease_risk': results['disease_risk'],
+            'historical_comparison': results['historical_comparison']
+        }
@@ -1,10 +1,12 @@
-import json
 import csv
+import orjson
 from io import StringIO
-from typing import Dict, List
+from typing import Dict, Iterator, List
 from datetime import datetime
 
 class ReportService:
+    __slots__ = ()
+
     @staticmethod
     def generate_json_report(field_data: Dict) -> str:
         """Generate JSON report of field analysis."""
@@ -12,58 +14,72 @@ class ReportService:
             'report_generated': datetime.now().isoformat(),
             'field_analysis': field_data
         }
-        return json.dumps(report, indent=2)
+        return orjson.dumps(report, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS).decode('utf-8')
     
     @staticmethod
-    def generate_csv_report(field_data: Dict) -> str:
-        """Generate CSV report of field analysis."""
-        output = StringIO()
-        writer = csv.writer(output)
-        
-        writer.writerow(['GreenPulse Field Analysis Report'])
-        writer.writerow(['Generated:', datetime.now().strftime('%Y-%m-%d %H:%M:%S')])
-        writer.writerow([])
+    def _csv_sections(field_data: Dict) -> Iterator[List[List]]:
+        """Yield the CSV report's sections in order, each as a list of rows."""
+        yield [
+            ['GreenPulse Field Analysis Report'],
+            ['Generated:', datetime.now().strftime('%Y-%m-%d %H:%M:%S')],
+            []
+        ]
         
         if 'yield_prediction' in field_data:
-            writer.writerow(['Yield Prediction'])
             yp = field_data['yield_prediction']
-            writer.writerow(['High Productivity %', yp.get('high_productivity_percent', 0)])
-            writer.writerow(['Medium Productivity %', yp.get('medium_productivity_percent', 0)])
-            writer.writerow(['Low Productivity %', yp.get('low_productivity_percent', 0)])
+            rows = [
+                ['Yield Prediction'],
+                ['High Productivity %', yp.get('high_productivity_percent', 0)],
+                ['Medium Productivity %', yp.get('medium_productivity_percent', 0)],
+                ['Low Productivity %', yp.get('low_productivity_percent', 0)]
+            ]
             if 'ndvi_stats' in yp:
-                writer.writerow(['Average NDVI', yp['ndvi_stats'].get('NDVI_mean', 0)])
-            writer.writerow([])
+                rows.append(['Average NDVI', yp['ndvi_stats'].get('NDVI_mean', 0)])
+            rows.append([])
+            yield rows
         
         if 'water_stress' in field_data:
-            writer.writerow(['Water Stress Analysis'])
             ws = field_data['water_stress']
-            writer.writerow(['Water Stress Area %', ws.get('water_stress_area_percent', 0)])
-            writer.writerow(['Average Moisture Index', ws.get('average_moisture_index', 0)])
-            writer.writerow(['Irrigation Required', 'Yes' if ws.get('requires_irrigation') else 'No'])
-            writer.writerow([])
+            yield [
+                ['Water Stress Analysis'],
+                ['Water Stress Area %', ws.get('water_stress_area_percent', 0)],
+                ['Average Moisture Index', ws.get('average_moisture_index', 0)],
+                ['Irrigation Required', 'Yes' if ws.get('requires_irrigation') else 'No'],
+                []
+            ]
         
         if 'disease_risk' in field_data:
-            writer.writerow(['Disease & Pest Risk'])
             dr = field_data['disease_risk']
-            writer.writerow(['Risk Level', dr.get('risk_level', 'unknown')])
-            writer.writerow(['Anomaly Area %', dr.get('anomaly_area_percent', 0)])
-            writer.writerow(['Alert Status', 'ACTIVE' if dr.get('alert') else 'None'])
-            writer.writerow([])
+            yield [
+                ['Disease & Pest Risk'],
+                ['Risk Level', dr.get('risk_level', 'unknown')],
+                ['Anomaly Area %', dr.get('anomaly_area_percent', 0)],
+                ['Alert Status', 'ACTIVE' if dr.get('alert') else 'None'],
+                []
+            ]
         
         if 'historical_comparison' in field_data:
-            writer.writerow(['Historical Comparison'])
-            hc = field_data['historical_comparison']
-            comp = hc.get('comparison', {})
-            writer.writerow(['Performance', comp.get('performance', 'unknown')])
-            writer.writerow(['Percent Change', comp.get('percent_change', 0)])
-            writer.writerow([])
+            comp = field_data['historical_comparison'].get('comparison', {})
+            yield [
+                ['Historical Comparison'],
+                ['Performance', comp.get('performance', 'unknown')],
+                ['Percent Change', comp.get('percent_change', 0)],
+                []
+            ]
+    
+    @staticmethod
+    def generate_csv_report(field_data: Dict) -> str:
+        """Generate CSV report of field analysis."""
+        output = StringIO()
+        writer = csv.writer(output)
+        
+        for rows in ReportService._csv_sections(field_data):
+            writer.writerows(rows)
         
         if 'crop_growth' in field_data:
-            writer.writerow(['Crop Growth Time Series'])
-            writer.writerow(['Date', 'NDVI'])
+            writer.writerows([['Crop Growth Time Series'], ['Date', 'NDVI']])
             cg = field_data['crop_growth']
-            for data_point in cg.get('time_series', []):
-                writer.writerow([data_point.get('date'), data_point.get('ndvi')])
+            writer.writerows([data_point.get('date'), data_point.get('ndvi')] for data_point in cg.get('time_series', []))
             writer.writerow([])
         
         return output.getvalue()
@@ -82,10 +98,10 @@ class ReportService:
         
         if 'yield_prediction' in field_data:
             yp = field_data['yield_prediction']
-            high_percent = yp.get('high_productivity_percent', 0)
+            high_percent = yp.get('high_productivity_percent') or 0
             health_factors.append(high_percent)
             
-            if yp.get('low_productivity_percent', 0) > 40:
+            if (yp.get('low_productivity_percent') or 0) > 40:
                 alerts.append("High percentage of low productivity areas detected")
         
         if 'water_stress' in field_data:
@@ -93,7 +109,7 @@ class ReportService:
             if ws.get('requires_irrigation'):
                 alerts.append("Irrigation required - significant water stress detected")
             
-            moisture_score = (ws.get('average_moisture_index', 0) + 1) * 50
+            moisture_score = ((ws.get('average_moisture_index') or 0) + 1) * 50
             health_factors.append(moisture_score)
         
         if 'disease_risk' in field_data:
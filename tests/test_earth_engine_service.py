@@ -0,0 +1,66 @@
+import unittest
+from unittest import mock
+
+import requests
+
+from services.earth_engine_service import EarthEngineService
+
+VALUES = {
+    'productivity_zones': {'zone': {'0': 1, '1': 1, '2': 2}},
+    'ndvi_stats': {'NDVI_mean': 0.5},
+    'water_stress': {'stats': {'NDMI_mean': 0.1}, 'total': 10, 'stressed': 1},
+    'time_series': {'list': [['2024-01-01', 0.4], ['2024-02-01', 0.5]]},
+    'disease_risk': {'stats': {'NDVI_mean': 0.0}, 'total': 10, 'anomalous': 0},
+    'historical_comparison': {'current': {'NDVI_mean': 0.5}, 'historical': {'NDVI_mean': 0.4}}
+}
+
+_EXPRS = (
+    '_productivity_zones_expr', '_ndvi_statistics_expr', '_water_stress_expr',
+    '_time_series_rows_expr', '_disease_risk_expr', '_historical_comparison_expr'
+)
+
+
+class AnalyzeFieldTest(unittest.TestCase):
+    def setUp(self):
+        EarthEngineService.analyze_field.cache.clear()
+        patches = [
+            mock.patch.object(EarthEngineService, 'build_composite'),
+            mock.patch('ee.Dictionary')
+        ] + [mock.patch.object(EarthEngineService, name) for name in _EXPRS]
+        self.mocks = {}
+        for patch in patches:
+            self.mocks[patch.attribute] = patch.start()
+            self.addCleanup(patch.stop)
+        self.getInfo = self.mocks['Dictionary'].return_value.getInfo
+        self.getInfo.return_value = VALUES
+        self.service = EarthEngineService.__new__(EarthEngineService)
+
+    def analyze(self, **kwargs):
+        return self.service.analyze_field('field', '2024-01-01', '2024-03-01', raise_exceptions=False, **kwargs)
+
+    def test_failed_parser_is_reported_in_its_own_section(self):
+        with mock.patch.object(EarthEngineService, '_water_stress_result', side_effect=ValueError('bad stats')):
+            report = self.analyze()
+
+        self.assertEqual(report['water_stress'], {'error': 'bad stats'})
+        self.assertEqual(report['yield_prediction']['high_productivity_percent'], 50.0)
+        self.assertEqual(len(report['crop_growth']['time_series']), 2)
+        self.assertEqual(report['disease_risk']['risk_level'], 'low')
+        self.assertEqual(report['historical_comparison']['comparison']['performance'], 'better')
+
+    def test_failed_parser_raises_when_requested(self):
+        with mock.patch.object(EarthEngineService, '_water_stress_result', side_effect=ValueError('bad stats')):
+            with self.assertRaises(ValueError):
+                self.service.analyze_field('field', '2024-01-01', '2024-03-01')
+
+    def test_transport_error_falls_back_to_individual_analyses(self):
+        self.getInfo.side_effect = requests.exceptions.ReadTimeout('read timed out')
+        with mock.patch.object(EarthEngineService, '_analyze_field_concurrently', return_value={'fallback': True}) as fallback:
+            report = self.analyze()
+
+        fallback.assert_called_once()
+        self.assertEqual(report, {'fallback': True})
+
+
+if __name__ == '__main__':
+    unittest.main()
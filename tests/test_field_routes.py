@@ -0,0 +1,59 @@
+import unittest
+from unittest import mock
+
+from app import app
+from config import Config
+from services.earth_engine_service import EarthEngineService
+
+COORDINATES = [[[0, 0], [0.01, 0], [0.01, 0.01], [0, 0]]]
+
+# A fully cloud-masked window: every reduceRegion mean comes back as None
+MASKED_VALUES = {
+    'productivity_zones': {'zone': {}},
+    'ndvi_stats': {'NDVI_mean': None, 'NDVI_min': None, 'NDVI_max': None, 'NDVI_stdDev': None},
+    'water_stress': {'stats': {'NDMI_mean': None}, 'total': 0, 'stressed': 0},
+    'time_series': {'list': []},
+    'disease_risk': {'stats': {'NDVI_mean': None}, 'total': 0, 'anomalous': 0},
+    'historical_comparison': {'current': {'NDVI_mean': None}, 'historical': {'NDVI_mean': 0.42}}
+}
+
+_EXPRS = (
+    '_productivity_zones_expr', '_ndvi_statistics_expr', '_water_stress_expr',
+    '_time_series_rows_expr', '_disease_risk_expr', '_historical_comparison_expr'
+)
+
+
+class FullAnalysisRouteTest(unittest.TestCase):
+    def setUp(self):
+        EarthEngineService.analyze_field.cache.clear()
+        patches = [
+            mock.patch.object(EarthEngineService, 'get_field_bounds', return_value='field'),
+            mock.patch.object(EarthEngineService, 'build_composite'),
+            mock.patch('ee.Dictionary')
+        ] + [mock.patch.object(EarthEngineService, name) for name in _EXPRS]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.client = app.test_client()
+
+    def post(self, values):
+        import ee
+        ee.Dictionary.return_value.getInfo.return_value = values
+        return self.client.post(
+            '/api/full-analysis',
+            json={'coordinates': COORDINATES},
+            headers={'X-API-Key': Config.API_KEY}
+        )
+
+    def test_none_means_are_reported_not_raised(self):
+        response = self.post(MASKED_VALUES)
+
+        self.assertEqual(response.status_code, 200)
+        body = response.get_json()
+        self.assertIsNone(body['water_stress']['average_moisture_index'])
+        self.assertEqual(body['historical_comparison']['comparison']['performance'], 'worse')
+        self.assertIsInstance(body['summary']['overall_health_score'], float)
+
+
+if __name__ == '__main__':
+    unittest.main()